@@ -3,8 +3,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import hashlib
+import heapq
 import json
-from typing import Annotated
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Annotated, ClassVar, Optional
 
 import yaml
 from box import Box, BoxList
@@ -32,6 +37,9 @@ class Dict(Box):
 class BaseObj(object):
     """BaseObj."""
 
+    # JSON Schema subset checked against dump() by validate_output()
+    output_schema = None
+
     def __init__(self, **kwargs):
         """Return a BaseObj.
 
@@ -191,9 +199,40 @@ class BaseObj(object):
         """Return sha256 hexdigest for self.root."""
         return hashlib.sha256(str(self.dump()).encode()).hexdigest()
 
+    def memory_report(self, depth=1):
+        """Return dict of key path to deep size in bytes for self.root.
+
+        Keys are expanded up to depth levels, e.g. "spec.containers[0]".
+        """
+        return _memory_report(self, depth)
+
+    def validate_output(self):
+        """Validate dump() against output_schema.
+
+        Raises ValueError listing every error and its key path.
+        """
+        errors = _validate_dumped((self.__class__, self.dump()))
+        if errors:
+            raise ABORT_EXCEPTION_TYPE("\n".join(errors))
+
+    def write_json(self, fp, sort_keys=False, compact=False, canonical=False, indent=None):
+        """Write self.root as JSON to fp without an intermediate dump() copy.
+
+        Output matches json.dump(self.dump(), fp) with the same options.
+        """
+        _write_json(self, fp, sort_keys=sort_keys, compact=compact, canonical=canonical, indent=indent)
+
+    def write_yaml(self, fp, sort_keys=False, compact=False, canonical=False, indent=None):
+        """Write self.root as YAML to fp without an intermediate dump() copy.
+
+        Output matches yaml.safe_dump(self.dump(), fp) with the same options.
+        """
+        _write_yaml(self, fp, sort_keys=sort_keys, compact=compact, canonical=canonical, indent=indent)
+
 
 class BaseModel(PydanticBaseModel):
     root: Annotated[Dict, Field(repr=False, exclude=True)] = Dict()
+    output_schema: ClassVar[Optional[dict]] = None
     model_config: Dict = {
         # https://docs.pydantic.dev/latest/migration/#changes-to-config
         "arbitrary_types_allowed": True,
@@ -255,3 +294,446 @@ class BaseModel(PydanticBaseModel):
     def dump(self):
         """Return object dict/list."""
         return self._dump(self)
+
+    def memory_report(self, depth=1):
+        """Return dict of key path to deep size in bytes for self.root.
+
+        Keys are expanded up to depth levels, e.g. "spec.containers[0]".
+        """
+        return _memory_report(self, depth)
+
+    def validate_output(self):
+        """Validate dump() against output_schema.
+
+        Raises ValueError listing every error and its key path.
+        """
+        errors = _validate_dumped((self.__class__, self.dump()))
+        if errors:
+            raise ABORT_EXCEPTION_TYPE("\n".join(errors))
+
+    def write_json(self, fp, sort_keys=False, compact=False, canonical=False, indent=None):
+        """Write self.root as JSON to fp without an intermediate dump() copy.
+
+        Output matches json.dump(self.dump(), fp) with the same options.
+        """
+        _write_json(self, fp, sort_keys=sort_keys, compact=compact, canonical=canonical, indent=indent)
+
+    def write_yaml(self, fp, sort_keys=False, compact=False, canonical=False, indent=None):
+        """Write self.root as YAML to fp without an intermediate dump() copy.
+
+        Output matches yaml.safe_dump(self.dump(), fp) with the same options.
+        """
+        _write_yaml(self, fp, sort_keys=sort_keys, compact=compact, canonical=canonical, indent=indent)
+
+
+def _join_path(path, key, index=False):
+    """Return dotted key path for key appended to path."""
+    if index:
+        return "{}[{}]".format(path, key)
+    if path:
+        return "{}.{}".format(path, key)
+    return str(key)
+
+
+def _box_sizeof(obj):
+    """Return size in bytes of the per-instance state of Box obj.
+
+    Each Box carries its own __dict__ with a _box_config dict; of its
+    values only the containers are per instance, the rest are shared
+    flags, strings and classes.
+    """
+    box_vars = vars(obj)
+    size = sys.getsizeof(box_vars)
+    config = box_vars.get("_box_config")
+    if config is not None:
+        size += sys.getsizeof(config)
+        for value in config.values():
+            if isinstance(value, (dict, list, tuple)) and value:
+                size += sys.getsizeof(value)
+    return size
+
+
+def _deep_sizeof(obj, _active=None):
+    """Return deep size in bytes of obj, following BaseObj/BaseModel roots.
+
+    BaseObj/BaseModel values count their whole instance __dict__, i.e.
+    root plus kwargs or model fields. Box values count their
+    per-instance _box_config.
+
+    Only the containers on the current branch are tracked to break
+    cycles, so memory used by the walk grows with nesting depth, not
+    with the number of nodes. Objects shared between branches are
+    counted once per reference.
+    """
+    if _active is None:
+        _active = set()
+    obj_id = id(obj)
+    if obj_id in _active:
+        return 0
+
+    if isinstance(obj, (BaseObj, BaseModel)):
+        _active.add(obj_id)
+        size = sys.getsizeof(obj) + _deep_sizeof(vars(obj), _active)
+        _active.discard(obj_id)
+        return size
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Box):
+        size += _box_sizeof(obj)
+    if isinstance(obj, dict):
+        _active.add(obj_id)
+        for k, v in obj.items():
+            size += _deep_sizeof(k, _active) + _deep_sizeof(v, _active)
+        _active.discard(obj_id)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        _active.add(obj_id)
+        for item in obj:
+            size += _deep_sizeof(item, _active)
+        _active.discard(obj_id)
+    return size
+
+
+def _memory_report(obj, depth=1, path="", report=None, _active=None):
+    """Return dict of key path to deep size in bytes for obj.
+
+    Dict/list values are expanded up to depth levels; nested
+    BaseObj/BaseModel values are expanded transparently, as in dump(),
+    so their kwargs are only counted where they are not expanded.
+    Values referring back to a node on their own path count as 0.
+    """
+    if report is None:
+        report = {}
+    if _active is None:
+        _active = set()
+    if id(obj) in _active:
+        report[path] = 0
+        return report
+
+    node = obj
+    while isinstance(node, (BaseObj, BaseModel)):
+        node = node.root
+
+    if depth > 0 and isinstance(node, (dict, list)) and node and id(node) not in _active:
+        _active.update((id(obj), id(node)))
+        if isinstance(node, dict):
+            for k, v in node.items():
+                _memory_report(v, depth - 1, _join_path(path, k), report, _active)
+        else:
+            for idx, item in enumerate(node):
+                _memory_report(item, depth - 1, _join_path(path, idx, index=True), report, _active)
+        _active.difference_update((id(obj), id(node)))
+    else:
+        report[path] = _deep_sizeof(obj, _active)
+    return report
+
+
+def memory_report_many(objs, depth=1, top=10):
+    """Rank heaviest classes and key paths across objs.
+
+    Returns a dict with "classes" and "paths", each a list of
+    (name, bytes) tuples sorted by size, at most top items long.
+    Class totals are the deep size of each object, including kwargs.
+    Paths are named "ClassName:path" and aggregated across objects of
+    the same class.
+    """
+    classes = defaultdict(int)
+    paths = defaultdict(int)
+    for obj in objs:
+        name = obj.__class__.__name__
+        classes[name] += _deep_sizeof(obj)
+        for path, size in obj.memory_report(depth=depth).items():
+            paths["{}:{}".format(name, path)] += size
+
+    def _by_size(item):
+        return item[1]
+
+    return {
+        "classes": heapq.nlargest(top, classes.items(), key=_by_size),
+        "paths": heapq.nlargest(top, paths.items(), key=_by_size),
+    }
+
+
+_JSON_TYPES = {
+    "object": (dict,),
+    "array": (list, tuple),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+
+def _is_json_type(value, type_name):
+    """Return True if value is of JSON Schema type_name."""
+    if isinstance(value, bool) and type_name in ("integer", "number"):
+        return False
+    return isinstance(value, _JSON_TYPES[type_name])
+
+
+def _json_equal(value, other):
+    """Return True if value equals other as JSON values, i.e. True != 1."""
+    return value == other and isinstance(value, bool) == isinstance(other, bool)
+
+
+def _compile_schema(schema):
+    """Return a validator function for a JSON Schema subset.
+
+    Supported keywords: type, enum, const, properties, required,
+    additionalProperties, items, minimum, maximum, minLength, maxLength,
+    pattern, minItems, maxItems, anyOf, nullable and
+    x-kubernetes-int-or-string. Other keywords are ignored.
+
+    The returned function takes (value, path, errors) and appends
+    (path, message) tuples to errors.
+    """
+    checks = []
+
+    if schema.get("x-kubernetes-int-or-string"):
+        types = ["integer", "string"]
+    else:
+        types = schema.get("type")
+        if isinstance(types, str):
+            types = [types]
+    if types:
+
+        def check_type(value, path, errors):
+            if not any(_is_json_type(value, t) for t in types):
+                errors.append((path, "expected {}, got {}".format(" or ".join(types), type(value).__name__)))
+                return False
+            return True
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        enum = schema["enum"]
+
+        def check_enum(value, path, errors):
+            if not any(_json_equal(value, item) for item in enum):
+                errors.append((path, "{!r} is not one of {!r}".format(value, enum)))
+            return True
+
+        checks.append(check_enum)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def check_const(value, path, errors):
+            if not _json_equal(value, const):
+                errors.append((path, "{!r} is not {!r}".format(value, const)))
+            return True
+
+        checks.append(check_const)
+
+    if "anyOf" in schema:
+        any_of = [_compile_schema(sub) for sub in schema["anyOf"]]
+
+        def check_any_of(value, path, errors):
+            for validator in any_of:
+                sub_errors = []
+                validator(value, path, sub_errors)
+                if not sub_errors:
+                    return True
+            errors.append((path, "does not match any of anyOf"))
+            return True
+
+        checks.append(check_any_of)
+
+    for keyword, op, message in (
+        ("minimum", lambda v, n: v >= n, "less than minimum"),
+        ("maximum", lambda v, n: v <= n, "greater than maximum"),
+    ):
+        if keyword in schema:
+
+            def check_bound(value, path, errors, _n=schema[keyword], _op=op, _msg=message):
+                if _is_json_type(value, "number") and not _op(value, _n):
+                    errors.append((path, "{!r} is {} {!r}".format(value, _msg, _n)))
+                return True
+
+            checks.append(check_bound)
+
+    for keyword, kind, op, message in (
+        ("minLength", str, lambda v, n: len(v) >= n, "shorter than"),
+        ("maxLength", str, lambda v, n: len(v) <= n, "longer than"),
+        ("minItems", (list, tuple), lambda v, n: len(v) >= n, "has fewer items than"),
+        ("maxItems", (list, tuple), lambda v, n: len(v) <= n, "has more items than"),
+    ):
+        if keyword in schema:
+
+            def check_length(value, path, errors, _n=schema[keyword], _kind=kind, _op=op, _msg=message):
+                if isinstance(value, _kind) and not _op(value, _n):
+                    errors.append((path, "{} {}".format(_msg, _n)))
+                return True
+
+            checks.append(check_length)
+
+    if "pattern" in schema:
+        pattern = re.compile(schema["pattern"])
+
+        def check_pattern(value, path, errors):
+            if isinstance(value, str) and not pattern.search(value):
+                errors.append((path, "{!r} does not match {!r}".format(value, pattern.pattern)))
+            return True
+
+        checks.append(check_pattern)
+
+    required = schema.get("required", ())
+    properties = {k: _compile_schema(v) for k, v in schema.get("properties", {}).items()}
+    additional = schema.get("additionalProperties", True)
+    if isinstance(additional, dict):
+        additional = _compile_schema(additional)
+    if required or properties or additional is not True:
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                return True
+            for key in required:
+                if key not in value:
+                    errors.append((path, "missing required key {!r}".format(key)))
+            for key, item in value.items():
+                validator = properties.get(key)
+                if validator is None:
+                    if additional is False:
+                        errors.append((path, "unexpected key {!r}".format(key)))
+                        continue
+                    if additional is True:
+                        continue
+                    validator = additional
+                validator(item, _join_path(path, key), errors)
+            return True
+
+        checks.append(check_object)
+
+    if "items" in schema:
+        items = _compile_schema(schema["items"])
+
+        def check_items(value, path, errors):
+            if isinstance(value, (list, tuple)):
+                for idx, item in enumerate(value):
+                    items(item, _join_path(path, idx, index=True), errors)
+            return True
+
+        checks.append(check_items)
+
+    nullable = schema.get("nullable", False)
+
+    def validate(value, path, errors):
+        if nullable and value is None:
+            return
+        for check in checks:
+            # stop on type mismatch, the remaining checks would be noise
+            if not check(value, path, errors):
+                return
+
+    return validate
+
+
+_output_validators = {}
+
+
+def _output_validator(cls):
+    """Return cached validator compiled from cls.output_schema, or None."""
+    try:
+        return _output_validators[cls]
+    except KeyError:
+        schema = cls.output_schema
+        validator = _compile_schema(schema) if schema is not None else None
+        _output_validators[cls] = validator
+        return validator
+
+
+def _validate_dumped(cls_and_data):
+    """Return list of error strings for dumped data of class cls."""
+    cls, data = cls_and_data
+    validator = _output_validator(cls)
+    if validator is None:
+        return []
+    errors = []
+    validator(data, "", errors)
+    return ['{}: "{}": {}'.format(cls.__name__, path, message) for path, message in errors]
+
+
+def _validation_item(obj):
+    """Return (cls, data) for obj, calling dump() unless already dumped."""
+    if isinstance(obj, (BaseObj, BaseModel)):
+        return obj.__class__, obj.dump()
+    return obj
+
+
+def validate_many(objs, processes=None, chunksize=16):
+    """Validate each obj against its class output_schema.
+
+    objs items are BaseObj/BaseModel values, which are dump()ed, or
+    (cls, data) pairs of already dumped data. Validators are compiled
+    once per class and cached. Set processes to validate in that many
+    worker processes; classes must then be importable at module level.
+    Returns a list with the error strings of each obj, in the same order
+    as objs.
+    """
+    items = (_validation_item(obj) for obj in objs)
+    if not processes:
+        return [_validate_dumped(item) for item in items]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_validate_dumped, items, chunksize=chunksize))
+
+
+def _json_default(obj):
+    """Return root of nested BaseObj/BaseModel values for json encoding."""
+    if isinstance(obj, (BaseObj, BaseModel)):
+        return obj.root
+    raise TypeError("Object of type {} is not JSON serializable".format(obj.__class__.__name__))
+
+
+def _write_json(obj, fp, sort_keys=False, compact=False, canonical=False, indent=None):
+    """Stream obj.root as JSON into fp.
+
+    Dict and BoxList are dict/list subclasses and are encoded in place;
+    nested BaseObj/BaseModel values are resolved to their root as they
+    are reached. canonical implies sort_keys and compact.
+    """
+    if canonical:
+        sort_keys = compact = True
+    separators = None
+    if compact:
+        separators = (",", ":")
+        indent = None
+    json.dump(obj.root, fp, sort_keys=sort_keys, indent=indent, separators=separators, default=_json_default)
+
+
+class _RootDumper(yaml.SafeDumper):
+    """SafeDumper representing Box values and BaseObj/BaseModel roots in place."""
+
+    def ignore_aliases(self, data):
+        # dump() output never shares nodes, don't emit anchors for live ones
+        return True
+
+
+def _represent_root(dumper, obj):
+    return dumper.represent_data(obj.root)
+
+
+_RootDumper.add_multi_representer(Box, _RootDumper.represent_dict)
+_RootDumper.add_multi_representer(BoxList, _RootDumper.represent_list)
+_RootDumper.add_multi_representer(BaseObj, _represent_root)
+_RootDumper.add_multi_representer(BaseModel, _represent_root)
+
+
+def _write_yaml(obj, fp, sort_keys=False, compact=False, canonical=False, indent=None):
+    """Write obj.root as YAML into fp.
+
+    This skips the dump() copy, but PyYAML still represents the whole
+    tree as a node graph before emitting it, so peak memory is only
+    partly reduced compared to yaml.safe_dump(obj.dump()).
+
+    compact uses flow style for collections; canonical emits YAML's
+    canonical form.
+    """
+    yaml.dump(
+        obj.root,
+        fp,
+        Dumper=_RootDumper,
+        sort_keys=sort_keys,
+        default_flow_style=compact,
+        canonical=canonical,
+        indent=indent,
+    )
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# Copyright 2021 The Kadet Authors
+# SPDX-FileCopyrightText: 2021 The Kadet Authors <kapitan-admins@googlegroups.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"memory report tests"
+
+import gc
+import tracemalloc
+import unittest
+
+from kadet import BaseModel, BaseObj, Dict, memory_report_many
+
+
+class MemoryModel(BaseModel):
+    name: str = "model"
+
+    def body(self):
+        self.root.name = self.name
+        self.root.spec.replicas = 1
+
+
+class MemoryReportTest(unittest.TestCase):
+    def test_memory_report_top_level(self):
+        bobj = BaseObj.from_dict({"a": "b", "big": ["x" * 1000]})
+        report = bobj.memory_report()
+        self.assertEqual(set(report), {"a", "big"})
+        self.assertGreater(report["big"], 1000)
+        self.assertGreater(report["big"], report["a"])
+
+    def test_memory_report_depth(self):
+        bobj = BaseObj()
+        bobj.root.spec.containers = [Dict({"image": "nginx"})]
+        bobj.root.spec.inner = BaseObj.from_dict({"i_am": "inside"})
+        bobj.root.kind = "Pod"
+        report = bobj.memory_report(depth=4)
+        self.assertEqual(
+            set(report),
+            {"spec.containers[0].image", "spec.inner.i_am", "kind"},
+        )
+
+    def test_memory_report_root_list(self):
+        bobj = BaseObj()
+        bobj.root = [1, "a"]
+        self.assertEqual(set(bobj.memory_report()), {"[0]", "[1]"})
+
+    def test_memory_report_cycle(self):
+        bobj = BaseObj.from_dict({"a": "b"})
+        bobj.root.self_ref = bobj
+        self.assertIs(bobj.root.self_ref, bobj)
+        shallow = bobj.memory_report(depth=1)
+        deep = bobj.memory_report(depth=5)
+        self.assertEqual(shallow, deep)
+        self.assertEqual(shallow["self_ref"], 0)
+        self.assertGreater(shallow["a"], 0)
+
+    def test_memory_report_box_config(self):
+        tracemalloc.start()
+        try:
+            gc.collect()
+            before = tracemalloc.get_traced_memory()[0]
+            bobj = BaseObj()
+            for i in range(2000):
+                bobj.root["k{}".format(i)] = {"inner": {"v": i}}
+            gc.collect()
+            traced = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        reported = sum(bobj.memory_report().values())
+        self.assertAlmostEqual(reported / traced, 1.0, delta=0.25)
+
+    def test_model_memory_report(self):
+        report = MemoryModel().memory_report(depth=2)
+        self.assertEqual(set(report), {"name", "spec.replicas"})
+
+    def test_memory_report_many(self):
+        small = BaseObj.from_dict({"a": "b"})
+        large = MemoryModel()
+        large.root.blob = "x" * 10000
+        ranking = memory_report_many([small, large, MemoryModel()], top=2)
+        self.assertEqual(ranking["classes"][0][0], "MemoryModel")
+        self.assertEqual(len(ranking["classes"]), 2)
+        self.assertEqual(ranking["paths"][0][0], "MemoryModel:blob")
+        self.assertEqual(len(ranking["paths"]), 2)
+
+    def test_memory_report_many_paths_per_class(self):
+        bobj = BaseObj.from_dict({"spec": {"a": "b"}})
+        ranking = memory_report_many([bobj, MemoryModel()])
+        names = [name for name, _ in ranking["paths"]]
+        self.assertIn("BaseObj:spec", names)
+        self.assertIn("MemoryModel:spec", names)
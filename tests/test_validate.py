@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+# Copyright 2021 The Kadet Authors
+# SPDX-FileCopyrightText: 2021 The Kadet Authors <kapitan-admins@googlegroups.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"output schema validation tests"
+
+import unittest
+
+from kadet import BaseModel, BaseObj, validate_many
+
+DEPLOYMENT_SCHEMA = {
+    "type": "object",
+    "required": ["kind", "metadata"],
+    "properties": {
+        "kind": {"const": "Deployment"},
+        "metadata": {
+            "type": "object",
+            "required": ["name"],
+            "properties": {"name": {"type": "string", "pattern": "^[a-z0-9-]+$", "maxLength": 63}},
+        },
+        "spec": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {
+                "replicas": {"type": "integer", "minimum": 0},
+                "strategy": {"enum": ["Recreate", "RollingUpdate"]},
+                "port": {"x-kubernetes-int-or-string": True},
+                "containers": {
+                    "type": "array",
+                    "minItems": 1,
+                    "items": {"type": "object", "required": ["image"]},
+                },
+            },
+        },
+    },
+}
+
+
+class Deployment(BaseObj):
+    output_schema = DEPLOYMENT_SCHEMA
+
+    def body(self):
+        self.root.kind = "Deployment"
+        self.root.metadata.name = self.kwargs.name
+        self.root.spec.replicas = self.kwargs.replicas
+        self.root.spec.containers = [{"image": "nginx"}]
+
+
+class DeploymentModel(BaseModel):
+    output_schema = DEPLOYMENT_SCHEMA
+    name: str
+    replicas: int = 1
+
+    def body(self):
+        self.root.kind = "Deployment"
+        self.root.metadata.name = self.name
+        self.root.spec.replicas = self.replicas
+
+
+class ValidateTest(unittest.TestCase):
+    def test_validate_output(self):
+        Deployment(name="web", replicas=2).validate_output()
+        DeploymentModel(name="web").validate_output()
+
+    def test_validate_output_errors(self):
+        with self.assertRaises(ValueError) as ctx:
+            Deployment(name="Web", replicas=-1).validate_output()
+        message = str(ctx.exception)
+        self.assertIn('Deployment: "metadata.name"', message)
+        self.assertIn('Deployment: "spec.replicas"', message)
+
+    def test_validate_without_schema(self):
+        BaseObj.from_dict({"anything": "goes"}).validate_output()
+
+    def test_validate_many(self):
+        objs = [
+            Deployment(name="web", replicas=1),
+            DeploymentModel(name="api"),
+            BaseObj.from_dict({"no": "schema"}),
+        ]
+        objs[0].root.spec.strategy = "Sometimes"
+        objs[0].root.spec.port = 8080
+        objs[0].root.spec.extra = True
+        objs[0].root.spec.containers = [{"name": "missing-image"}]
+        objs[1].root.spec.replicas = "two"
+        del objs[1].root.metadata
+        errors = validate_many(objs)
+        self.assertEqual(len(errors), 3)
+        self.assertCountEqual(
+            errors[0],
+            [
+                "Deployment: \"spec.containers[0]\": missing required key 'image'",
+                "Deployment: \"spec.strategy\": 'Sometimes' is not one of ['Recreate', 'RollingUpdate']",
+                "Deployment: \"spec\": unexpected key 'extra'",
+            ],
+        )
+        self.assertEqual(
+            errors[1],
+            [
+                "DeploymentModel: \"\": missing required key 'metadata'",
+                'DeploymentModel: "spec.replicas": expected integer, got str',
+            ],
+        )
+        self.assertEqual(errors[2], [])
+
+    def test_validate_many_dumped(self):
+        dumped = Deployment(name="web", replicas=-1).dump()
+        errors = validate_many([(Deployment, dumped), (BaseObj, {"no": "schema"})])
+        self.assertEqual(errors, [['Deployment: "spec.replicas": -1 is less than minimum 0'], []])
+
+    def test_validate_nullable_enum_tuple(self):
+        class Schema(BaseObj):
+            output_schema = {
+                "type": "object",
+                "properties": {
+                    "maybe": {"type": "string", "nullable": True},
+                    "never": {"type": "string"},
+                    "one": {"enum": [1]},
+                    "flag": {"const": True},
+                    "tags": {"type": "array", "minItems": 2, "items": {"type": "string"}},
+                },
+            }
+
+        bobj = BaseObj()
+        bobj.root = {"maybe": None, "never": None, "one": True, "flag": 1, "tags": ("a", 2)}
+        errors = validate_many([(Schema, bobj.dump())])[0]
+        self.assertCountEqual(
+            errors,
+            [
+                'Schema: "never": expected string, got NoneType',
+                'Schema: "one": True is not one of [1]',
+                'Schema: "flag": 1 is not True',
+                'Schema: "tags[1]": expected string, got int',
+            ],
+        )
+
+    def test_validate_many_processes(self):
+        objs = [Deployment(name="web", replicas=i) for i in (1, -1)]
+        errors = validate_many(objs, processes=2)
+        self.assertEqual(errors[0], [])
+        self.assertEqual(errors[1], ['Deployment: "spec.replicas": -1 is less than minimum 0'])
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# Copyright 2021 The Kadet Authors
+# SPDX-FileCopyrightText: 2021 The Kadet Authors <kapitan-admins@googlegroups.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"write_json/write_yaml tests"
+
+import io
+import json
+import unittest
+
+import yaml
+
+from kadet import BaseModel, BaseObj, Dict
+
+
+class WriteModel(BaseModel):
+    name: str = "model"
+
+    def body(self):
+        self.root.name = self.name
+        self.root.labels = {"b": "2", "a": "1"}
+
+
+def make_obj():
+    bobj = BaseObj()
+    bobj.root.zkey = "last"
+    bobj.root.akey = {"nested": [1, 2.5, None, True]}
+    bobj.root.with_baseobj = BaseObj.from_dict({"inside": "BaseObj"})
+    bobj.root.with_model = WriteModel()
+    bobj.root.with_lists = [
+        Dict({"i_am_inside_a_list": True}),
+        BaseObj.from_dict({"list_of_objs": [BaseObj.from_dict(dict(b=1, a=2))]}),
+    ]
+    list_obj = BaseObj()
+    list_obj.root = ["x", "ü"]
+    bobj.root.with_list_root = list_obj
+    return bobj
+
+
+class WriteTest(unittest.TestCase):
+    def test_write_json(self):
+        for opts in ({}, {"sort_keys": True}, {"indent": 4}, {"compact": True}):
+            fp = io.StringIO()
+            make_obj().write_json(fp, **opts)
+            kwargs = {"sort_keys": opts.get("sort_keys", False), "indent": opts.get("indent")}
+            if opts.get("compact"):
+                kwargs["separators"] = (",", ":")
+            self.assertEqual(fp.getvalue(), json.dumps(make_obj().dump(), **kwargs))
+
+    def test_write_json_canonical(self):
+        fp = io.StringIO()
+        make_obj().write_json(fp, canonical=True)
+        self.assertEqual(fp.getvalue(), json.dumps(make_obj().dump(), sort_keys=True, separators=(",", ":")))
+
+    def test_write_yaml(self):
+        for opts in ({}, {"sort_keys": True}, {"canonical": True}, {"indent": 4}):
+            fp = io.StringIO()
+            make_obj().write_yaml(fp, **opts)
+            self.assertEqual(fp.getvalue(), yaml.safe_dump(make_obj().dump(), **{"sort_keys": False, **opts}))
+
+    def test_write_yaml_compact(self):
+        fp = io.StringIO()
+        make_obj().write_yaml(fp, compact=True)
+        expected = yaml.safe_dump(make_obj().dump(), sort_keys=False, default_flow_style=True)
+        self.assertEqual(fp.getvalue(), expected)
+
+    def test_write_yaml_shared_values(self):
+        shared = Dict({"a": 1})
+        bobj = BaseObj()
+        bobj.root.first = shared
+        bobj.root.second = shared
+        fp = io.StringIO()
+        bobj.write_yaml(fp)
+        self.assertNotIn("&id", fp.getvalue())
+
+    def test_model_write(self):
+        json_fp = io.StringIO()
+        yaml_fp = io.StringIO()
+        WriteModel().write_json(json_fp)
+        WriteModel().write_yaml(yaml_fp)
+        self.assertEqual(json.loads(json_fp.getvalue()), WriteModel().dump())
+        self.assertEqual(yaml.safe_load(yaml_fp.getvalue()), WriteModel().dump())
+
+    def test_write_does_not_modify_root(self):
+        bobj = make_obj()
+        bobj.write_json(io.StringIO())
+        bobj.write_yaml(io.StringIO())
+        self.assertIsInstance(bobj.root.with_baseobj, BaseObj)